@@ -0,0 +1,191 @@
+"""Benchmark recent-window incident queries across the hot/cold storage steps.
+
+Loads several years of synthetic incidents, then times the dashboard's hot
+paths (/api/incidents and /api/stats) after each step:
+
+  flat         - one incidents table with no date index (the original layout)
+  index        - the same table plus the date_occurred index
+  partitioned  - yearly partitions (PostgreSQL only, via the startup migration)
+  archived     - cold years moved to compressed incident_archive
+
+By default a throwaway SQLite database is used and removed afterwards. With
+--postgresql the DATABASE_URL database is used instead; its incidents and
+incident_archive tables are dropped, so point it at a scratch database.
+
+Usage: python benchmark_incidents.py [--postgresql] [--years 15] [--per-year 20000]
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import argparse
+from datetime import date, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--postgresql', action='store_true', help='Benchmark the DATABASE_URL database')
+parser.add_argument('--years', type=int, default=15, help='Years of history to generate')
+parser.add_argument('--per-year', type=int, default=20000, help='Incidents per year')
+parser.add_argument('--repeat', type=int, default=50, help='Requests per measurement')
+args = parser.parse_args()
+
+if args.postgresql:
+    if not os.environ.get('DATABASE_URL'):
+        parser.error('--postgresql needs DATABASE_URL to be set')
+    workdir = None
+else:
+    workdir = tempfile.mkdtemp(prefix='rhino-bench-')
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['DATABASE_PATH'] = os.path.join(workdir, 'bench.db')
+
+import render_app  # noqa: E402  (reads DATABASE_URL / DATABASE_PATH)
+from render_app import app, archive_cold_incidents, get_db_connection  # noqa: E402
+
+PROVINCES = ['Mpumalanga', 'KwaZulu-Natal', 'North West', 'Limpopo', 'Eastern Cape']
+PATHS = ('/api/incidents', '/api/incidents?province=Limpopo', '/api/stats')
+
+
+def synthetic_incidents():
+    today = date.today()
+    rows = []
+    for offset in range(args.years):
+        year = today.year - offset
+        for _ in range(args.per_year):
+            occurred = date(year, 1, 1) + timedelta(days=random.randrange(365))
+            if occurred > today:
+                occurred = today - timedelta(days=random.randrange(30))
+            rows.append((
+                'Synthetic incident', 'Generated for benchmarking', 'Kruger National Park',
+                random.choice(PROVINCES), occurred.isoformat(), 'Benchmark',
+                random.random() < 0.6, random.randint(0, 3)
+            ))
+    return rows
+
+
+def execute(*statements):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for statement in statements:
+        cursor.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+def setup_sqlite():
+    conn = get_db_connection()
+    conn.executemany('''
+        INSERT INTO incidents
+        (title, description, location, province, date_occurred, source, verified, rhino_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', synthetic_incidents())
+    conn.execute('DROP INDEX idx_incidents_date_occurred')
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+
+
+def setup_postgresql():
+    """Replace the partitioned tables with the original flat layout"""
+    from psycopg2.extras import execute_values
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS incidents CASCADE')
+    cursor.execute('DELETE FROM incident_archive')
+    cursor.execute('''
+        CREATE TABLE incidents (
+            id SERIAL PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            location TEXT,
+            province TEXT,
+            date_occurred DATE,
+            date_reported TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source TEXT,
+            verified BOOLEAN DEFAULT FALSE,
+            rhino_count INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    execute_values(cursor, '''
+        INSERT INTO incidents
+        (title, description, location, province, date_occurred, source, verified, rhino_count)
+        VALUES %s
+    ''', synthetic_incidents())
+    cursor.execute('ANALYZE incidents')
+    conn.commit()
+    conn.close()
+
+
+def database_size_mb():
+    if args.postgresql:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT pg_database_size(current_database())')
+        size = cursor.fetchone()[0]
+        conn.close()
+    else:
+        size = os.path.getsize(app.config['DATABASE_PATH'])
+    return size / 1024 / 1024
+
+
+def measure(label):
+    client = app.test_client()
+    results = {}
+    for path in PATHS:
+        response = client.get(path)
+        assert response.status_code == 200, response.get_json()
+        for _ in range(5):
+            client.get(path)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            client.get(path)
+        results[path] = (time.perf_counter() - start) / args.repeat * 1000
+
+    print(f'{label}: database {database_size_mb():.1f} MB')
+    for path, ms in results.items():
+        print(f'  {path:<36} {ms:8.2f} ms/request')
+    return label, results
+
+
+def main():
+    if args.postgresql and not app.config.get('USE_POSTGRESQL'):
+        raise SystemExit('Could not connect to DATABASE_URL')
+
+    stages = []
+    if args.postgresql:
+        setup_postgresql()
+        stages.append(measure('flat'))
+        # Named apart from the partitioned index so the migration creates its own
+        execute('CREATE INDEX incidents_flat_date_occurred_idx ON incidents (date_occurred DESC)',
+                'ANALYZE incidents')
+        stages.append(measure('index'))
+
+        conn = get_db_connection()
+        render_app.init_postgresql_incidents(conn.cursor())
+        conn.commit()
+        conn.close()
+        execute('ANALYZE incidents')
+        stages.append(measure('partitioned'))
+    else:
+        setup_sqlite()
+        stages.append(measure('flat'))
+        execute('CREATE INDEX idx_incidents_date_occurred ON incidents (date_occurred DESC)')
+        stages.append(measure('index'))
+
+    archived = archive_cold_incidents()
+    print(f"archived years: {', '.join(str(year) for year in archived)}")
+    stages.append(measure('archived'))
+
+    print('speedup over previous step:')
+    for (_, previous), (label, current) in zip(stages, stages[1:]):
+        print(f'  {label}')
+        for path in PATHS:
+            print(f'    {path:<34} {previous[path] / current[path]:8.1f}x')
+
+
+try:
+    main()
+finally:
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
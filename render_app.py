@@ -1,10 +1,13 @@
 import os
+import json
+import zlib
 import sqlite3
+import click
 from flask import Flask, jsonify, request, render_template_string, send_from_directory
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 from werkzeug.security import check_password_hash
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 app = Flask(__name__)
 CORS(app)
@@ -24,11 +27,15 @@ if database_url:
     app.config['USE_POSTGRESQL'] = True
 else:
     # SQLite fallback
-    app.config['DATABASE_PATH'] = 'rhino_dashboard.db'
+    app.config['DATABASE_PATH'] = os.environ.get('DATABASE_PATH', 'rhino_dashboard.db')
     app.config['USE_POSTGRESQL'] = False
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Number of calendar years (including the current one) kept in the hot
+# incidents table; older years are moved to incident_archive.
+app.config['ARCHIVE_HOT_YEARS'] = int(os.environ.get('ARCHIVE_HOT_YEARS', 2))
+
 jwt = JWTManager(app)
 
 def init_db():
@@ -60,6 +67,25 @@ def init_sqlite():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_incidents_date_occurred
+        ON incidents (date_occurred DESC)
+    ''')
+    
+    # Create archive table for cold years
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS incident_archive (
+            year INTEGER PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            verified_count INTEGER NOT NULL,
+            rhino_total INTEGER NOT NULL,
+            province_counts TEXT NOT NULL,
+            min_id INTEGER NOT NULL,
+            max_id INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
     
     # Create users table
     cursor.execute('''
@@ -118,22 +144,25 @@ def init_postgresql():
         )
         cursor = conn.cursor()
         
-        # Create incidents table
+        # Create incidents table, partitioned by year of date_occurred
+        init_postgresql_incidents(cursor)
+        
+        # Create archive table for cold years
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS incidents (
-                id SERIAL PRIMARY KEY,
-                title TEXT NOT NULL,
-                description TEXT,
-                location TEXT,
-                province TEXT,
-                date_occurred DATE,
-                date_reported TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                source TEXT,
-                verified BOOLEAN DEFAULT FALSE,
-                rhino_count INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            CREATE TABLE IF NOT EXISTS incident_archive (
+                year INTEGER PRIMARY KEY,
+                row_count INTEGER NOT NULL,
+                verified_count INTEGER NOT NULL,
+                rhino_total INTEGER NOT NULL,
+                province_counts TEXT NOT NULL,
+                min_id INTEGER NOT NULL,
+                max_id INTEGER NOT NULL,
+                payload BYTEA NOT NULL,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        # Payloads are already zlib-compressed; skip TOAST recompression
+        cursor.execute('ALTER TABLE incident_archive ALTER COLUMN payload SET STORAGE EXTERNAL')
         
         # Create users table
         cursor.execute('''
@@ -147,8 +176,8 @@ def init_postgresql():
             )
         ''')
         
-        # Insert sample data (only if tables are empty)
-        cursor.execute('SELECT COUNT(*) FROM incidents')
+        # Insert sample data (only if tables are empty, archived years included)
+        cursor.execute('SELECT (SELECT COUNT(*) FROM incidents) + (SELECT COUNT(*) FROM incident_archive)')
         if cursor.fetchone()[0] == 0:
             sample_incidents = [
                 ('Rhino Poaching Incident - Kruger National Park', 'Two rhinos found dead with horns removed', 'Kruger National Park', 'Mpumalanga', '2024-01-15', 'DFFE Report', True, 2),
@@ -165,6 +194,9 @@ def init_postgresql():
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 ''', incident)
         
+        # Give seeded or back-filled years their own partitions
+        partition_default_incidents(cursor)
+        
         # Insert default admin user (only if users table is empty)
         cursor.execute('SELECT COUNT(*) FROM users')
         if cursor.fetchone()[0] == 0:
@@ -187,6 +219,78 @@ def init_postgresql():
         app.config['USE_POSTGRESQL'] = False
         init_sqlite()
 
+def init_postgresql_incidents(cursor):
+    """Create the yearly-partitioned incidents table, migrating a plain one if present"""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('incidents')")
+    row = cursor.fetchone()
+    migrate = row is not None and row[0] == 'r'
+    if migrate:
+        cursor.execute('ALTER TABLE incidents RENAME TO incidents_unpartitioned')
+
+    # Partitioned tables cannot carry a primary key that excludes the
+    # partition key, so id is indexed rather than declared PRIMARY KEY.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS incidents (
+            id SERIAL,
+            title TEXT NOT NULL,
+            description TEXT,
+            location TEXT,
+            province TEXT,
+            date_occurred DATE,
+            date_reported TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source TEXT,
+            verified BOOLEAN DEFAULT FALSE,
+            rhino_count INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) PARTITION BY RANGE (date_occurred)
+    ''')
+    cursor.execute('CREATE TABLE IF NOT EXISTS incidents_default PARTITION OF incidents DEFAULT')
+    cursor.execute('CREATE INDEX IF NOT EXISTS incidents_id_idx ON incidents (id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS incidents_date_occurred_idx ON incidents (date_occurred DESC)')
+
+    years = {datetime.now().year, datetime.now().year + 1}
+    if migrate:
+        cursor.execute('''
+            SELECT DISTINCT EXTRACT(YEAR FROM date_occurred)::int
+            FROM incidents_unpartitioned WHERE date_occurred IS NOT NULL
+        ''')
+        years.update(row[0] for row in cursor.fetchall())
+    for year in sorted(years):
+        ensure_incident_partition(cursor, year)
+
+    if migrate:
+        cursor.execute('INSERT INTO incidents SELECT * FROM incidents_unpartitioned')
+        cursor.execute('''
+            SELECT setval(pg_get_serial_sequence('incidents', 'id'), COALESCE(MAX(id), 0) + 1, false)
+            FROM incidents
+        ''')
+        cursor.execute('DROP TABLE incidents_unpartitioned')
+
+def partition_default_incidents(cursor):
+    """Move dated rows out of the default partition into yearly partitions"""
+    cursor.execute('''
+        SELECT DISTINCT EXTRACT(YEAR FROM date_occurred)::int
+        FROM incidents_default WHERE date_occurred IS NOT NULL
+    ''')
+    for (year,) in cursor.fetchall():
+        ensure_incident_partition(cursor, year)
+
+def ensure_incident_partition(cursor, year):
+    """Attach the partition for a year, moving its rows out of the default partition"""
+    partition = f'incidents_y{int(year)}'
+    cursor.execute('SELECT to_regclass(%s)', (partition,))
+    if cursor.fetchone()[0] is not None:
+        return
+
+    start, end = f'{year}-01-01', f'{year + 1}-01-01'
+    cursor.execute(f'CREATE TABLE {partition} (LIKE incidents INCLUDING DEFAULTS)')
+    cursor.execute(f'''
+        INSERT INTO {partition}
+        SELECT * FROM incidents_default WHERE date_occurred >= %s AND date_occurred < %s
+    ''', (start, end))
+    cursor.execute('DELETE FROM incidents_default WHERE date_occurred >= %s AND date_occurred < %s', (start, end))
+    cursor.execute(f"ALTER TABLE incidents ATTACH PARTITION {partition} FOR VALUES FROM ('{start}') TO ('{end}')")
+
 def get_db_connection():
     """Get database connection based on configuration"""
     if app.config.get('USE_POSTGRESQL'):
@@ -210,6 +314,196 @@ def get_db_connection():
     else:
         return sqlite3.connect(app.config['DATABASE_PATH'])
 
+def row_to_incident(row):
+    """Convert an incidents row into its API representation"""
+    return {
+        'id': row[0],
+        'title': row[1],
+        'description': row[2],
+        'location': row[3],
+        'province': row[4],
+        'date_occurred': row[5],
+        'date_reported': row[6],
+        'source': row[7],
+        'verified': bool(row[8]),
+        'rhino_count': row[9],
+        'created_at': row[10]
+    }
+
+def compress_incident_rows(rows):
+    """Pack incidents rows into a zlib-compressed JSON payload"""
+    encoded = [
+        [value.isoformat() if isinstance(value, date) else value for value in row]
+        for row in rows
+    ]
+    return zlib.compress(json.dumps(encoded, separators=(',', ':')).encode('utf-8'), 9)
+
+def decompress_incident_rows(payload):
+    """Unpack an archive payload into rows shaped like the incidents table"""
+    rows = json.loads(zlib.decompress(bytes(payload)).decode('utf-8'))
+    if app.config.get('USE_POSTGRESQL'):
+        # Match the date/timestamp types psycopg2 returns for hot rows
+        for row in rows:
+            if row[5] is not None:
+                row[5] = date.fromisoformat(row[5])
+            for i in (6, 10):
+                if row[i] is not None:
+                    row[i] = datetime.fromisoformat(row[i])
+    return rows
+
+def archived_incident_years(cursor, year=None, province=None, verified=None):
+    """List archived years newest first, skipping years the filters cannot match"""
+    placeholder = '%s' if app.config.get('USE_POSTGRESQL') else '?'
+    query = 'SELECT year, row_count, verified_count, province_counts FROM incident_archive'
+    params = []
+    if year is not None:
+        query += f' WHERE year = {placeholder}'
+        params.append(year)
+    cursor.execute(query + ' ORDER BY year DESC', params)
+
+    years = []
+    for archived_year, row_count, verified_count, province_counts in cursor.fetchall():
+        if province and province not in {name for name, _ in json.loads(province_counts)}:
+            continue
+        if verified is True and verified_count == 0:
+            continue
+        if verified is False and verified_count == row_count:
+            continue
+        years.append(archived_year)
+    return years
+
+def load_archived_incidents(cursor, year):
+    """Decompress the archived incidents for a single year"""
+    placeholder = '%s' if app.config.get('USE_POSTGRESQL') else '?'
+    cursor.execute(f'SELECT payload FROM incident_archive WHERE year = {placeholder}', (year,))
+    row = cursor.fetchone()
+    return decompress_incident_rows(row[0]) if row else []
+
+def find_archived_incident(cursor, incident_id):
+    """Look up a single archived incident by ID"""
+    placeholder = '%s' if app.config.get('USE_POSTGRESQL') else '?'
+    cursor.execute(f'''
+        SELECT payload FROM incident_archive
+        WHERE min_id <= {placeholder} AND max_id >= {placeholder}
+    ''', (incident_id, incident_id))
+    for (payload,) in cursor.fetchall():
+        for row in decompress_incident_rows(payload):
+            if row[0] == incident_id:
+                return row
+    return None
+
+def archive_cold_incidents(hot_years=None):
+    """Move incidents older than the hot window into compressed yearly archives.
+
+    Each cold year becomes one incident_archive row holding the zlib-compressed
+    incidents plus the aggregates /api/stats needs. On PostgreSQL the year's
+    partition is dropped outright; on SQLite the rows are deleted and the file
+    vacuumed. The job runs in a single transaction that blocks concurrent
+    writes to incidents. The year containing the start of the 30-day
+    recent_incidents window is always kept hot, even in January.
+    Returns the list of archived years.
+    """
+    if hot_years is None:
+        hot_years = app.config['ARCHIVE_HOT_YEARS']
+    if hot_years < 1:
+        # New rows land in the current year, so it must stay hot
+        raise ValueError(f'hot_years must be at least 1, got {hot_years}')
+    # recent_incidents only counts the hot table, so never archive the year
+    # its 30-day window starts in (last December, early in the year)
+    recent_year = (date.today() - timedelta(days=30)).year
+    cutoff = f'{min(date.today().year - hot_years + 1, recent_year)}-01-01'
+
+    use_postgresql = app.config.get('USE_POSTGRESQL')
+    placeholder = '%s' if use_postgresql else '?'
+    if use_postgresql:
+        year_expr = 'EXTRACT(YEAR FROM date_occurred)::int'
+    else:
+        year_expr = "CAST(strftime('%Y', date_occurred) AS INTEGER)"
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # Block concurrent writers for the whole job so no incident committed
+    # between reading a year and deleting it is lost; readers still proceed.
+    if use_postgresql:
+        cursor.execute('LOCK TABLE incidents IN SHARE ROW EXCLUSIVE MODE')
+        # Rows parked in the default partition would otherwise be deleted
+        # row by row instead of having their partition dropped
+        partition_default_incidents(cursor)
+    else:
+        cursor.execute('BEGIN IMMEDIATE')
+
+    cursor.execute(f'''
+        SELECT DISTINCT {year_expr} FROM incidents
+        WHERE date_occurred < {placeholder} ORDER BY 1
+    ''', (cutoff,))
+    years = [row[0] for row in cursor.fetchall()]
+
+    for year in years:
+        start, end = f'{year}-01-01', f'{year + 1}-01-01'
+        cursor.execute(f'''
+            SELECT * FROM incidents
+            WHERE date_occurred >= {placeholder} AND date_occurred < {placeholder}
+        ''', (start, end))
+        rows = [list(row) for row in cursor.fetchall()]
+
+        # Merge with rows archived by an earlier run (late-reported incidents)
+        cursor.execute(f'SELECT payload FROM incident_archive WHERE year = {placeholder}', (year,))
+        existing = cursor.fetchone()
+        if existing:
+            rows.extend(decompress_incident_rows(existing[0]))
+        rows.sort(key=lambda row: (row[5], row[0]), reverse=True)
+
+        province_counts = {}
+        for row in rows:
+            province_counts[row[4]] = province_counts.get(row[4], 0) + 1
+
+        cursor.execute(f'DELETE FROM incident_archive WHERE year = {placeholder}', (year,))
+        cursor.execute(f'''
+            INSERT INTO incident_archive
+            (year, row_count, verified_count, rhino_total, province_counts, min_id, max_id, payload)
+            VALUES ({', '.join([placeholder] * 8)})
+        ''', (
+            year,
+            len(rows),
+            sum(1 for row in rows if row[8]),
+            sum(row[9] or 0 for row in rows),
+            json.dumps(list(province_counts.items())),
+            min(row[0] for row in rows),
+            max(row[0] for row in rows),
+            compress_incident_rows(rows)
+        ))
+
+        if use_postgresql:
+            cursor.execute('SELECT to_regclass(%s)', (f'incidents_y{year}',))
+            if cursor.fetchone()[0] is not None:
+                cursor.execute(f'DROP TABLE incidents_y{year}')
+            else:
+                cursor.execute('DELETE FROM incidents WHERE date_occurred >= %s AND date_occurred < %s', (start, end))
+        else:
+            cursor.execute('DELETE FROM incidents WHERE date_occurred >= ? AND date_occurred < ?', (start, end))
+    conn.commit()
+
+    if years and not use_postgresql:
+        conn.execute('VACUUM')
+    conn.close()
+    return years
+
+@app.cli.command('archive-incidents')
+@click.option('--hot-years', type=click.IntRange(min=1), default=None,
+              help='Calendar years to keep hot (default: ARCHIVE_HOT_YEARS).')
+def archive_incidents_command(hot_years):
+    """Move cold years of incidents into compressed archive storage"""
+    try:
+        years = archive_cold_incidents(hot_years)
+    except ValueError as e:
+        # ARCHIVE_HOT_YEARS from the environment is only checked here
+        raise click.ClickException(str(e))
+    if years:
+        click.echo(f"Archived incidents for: {', '.join(str(year) for year in years)}")
+    else:
+        click.echo('No cold incidents to archive')
+
 # Initialize database on startup
 init_db()
 
@@ -252,6 +546,10 @@ def get_incidents():
         province = request.args.get('province')
         verified = request.args.get('verified')
         limit = request.args.get('limit', 50, type=int)
+        if limit <= 0:
+            conn.close()
+            return jsonify([])
+        year = request.args.get('year', type=int)
         
         # Build query
         if app.config.get('USE_POSTGRESQL'):
@@ -266,7 +564,11 @@ def get_incidents():
                 query += " AND verified = %s"
                 params.append(verified.lower() == 'true')
             
-            query += " ORDER BY date_occurred DESC LIMIT %s"
+            if year is not None:
+                query += " AND date_occurred >= %s AND date_occurred < %s"
+                params.extend([f'{year}-01-01', f'{year + 1}-01-01'])
+            
+            query += " ORDER BY date_occurred DESC NULLS LAST LIMIT %s"
             params.append(limit)
         else:
             query = "SELECT * FROM incidents WHERE 1=1"
@@ -280,26 +582,32 @@ def get_incidents():
                 query += " AND verified = ?"
                 params.append(1 if verified.lower() == 'true' else 0)
             
+            if year is not None:
+                query += " AND date_occurred >= ? AND date_occurred < ?"
+                params.extend([f'{year}-01-01', f'{year + 1}-01-01'])
+            
             query += " ORDER BY date_occurred DESC LIMIT ?"
             params.append(limit)
         
         cursor.execute(query, params)
-        incidents = []
-        
-        for row in cursor.fetchall():
-            incidents.append({
-                'id': row[0],
-                'title': row[1],
-                'description': row[2],
-                'location': row[3],
-                'province': row[4],
-                'date_occurred': row[5],
-                'date_reported': row[6],
-                'source': row[7],
-                'verified': bool(row[8]),
-                'rhino_count': row[9],
-                'created_at': row[10]
-            })
+        rows = cursor.fetchall()
+        
+        # Merge archived years newest first. Late-reported incidents can sit
+        # in the hot table with an old date_occurred, so stop only once the
+        # page is full and its oldest row is newer than the next archived year.
+        wanted = None if verified is None else verified.lower() == 'true'
+        for archived_year in archived_incident_years(cursor, year, province, wanted):
+            if rows and len(rows) >= limit and rows[-1][5] is not None and int(str(rows[-1][5])[:4]) > archived_year:
+                break
+            archived = [
+                row for row in load_archived_incidents(cursor, archived_year)
+                if (not province or row[4] == province)
+                and (wanted is None or bool(row[8]) == wanted)
+            ]
+            rows = sorted(list(rows) + archived,
+                          key=lambda row: (row[5] is not None, row[5] or ''), reverse=True)[:limit]
+        
+        incidents = [row_to_incident(row) for row in rows]
         
         conn.close()
         return jsonify(incidents)
@@ -319,21 +627,11 @@ def get_incident(incident_id):
             cursor.execute("SELECT * FROM incidents WHERE id = ?", (incident_id,))
         
         row = cursor.fetchone()
+        if row is None:
+            row = find_archived_incident(cursor, incident_id)
         
         if row:
-            incident = {
-                'id': row[0],
-                'title': row[1],
-                'description': row[2],
-                'location': row[3],
-                'province': row[4],
-                'date_occurred': row[5],
-                'date_reported': row[6],
-                'source': row[7],
-                'verified': bool(row[8]),
-                'rhino_count': row[9],
-                'created_at': row[10]
-            }
+            incident = row_to_incident(row)
             conn.close()
             return jsonify(incident)
         
@@ -368,6 +666,22 @@ def get_statistics():
         cursor.execute("SELECT province, COUNT(*) FROM incidents GROUP BY province")
         provinces = dict(cursor.fetchall())
         
+        # Fold in archived years from their precomputed aggregates
+        cursor.execute("""
+            SELECT COALESCE(SUM(row_count), 0), COALESCE(SUM(verified_count), 0),
+                   COALESCE(SUM(rhino_total), 0)
+            FROM incident_archive
+        """)
+        archived_incidents, archived_verified, archived_rhinos = cursor.fetchone()
+        total_incidents += archived_incidents
+        verified_incidents += archived_verified
+        total_rhinos += archived_rhinos
+        
+        cursor.execute("SELECT province_counts FROM incident_archive")
+        for (province_counts,) in cursor.fetchall():
+            for province, count in json.loads(province_counts):
+                provinces[province] = provinces.get(province, 0) + count
+        
         # Recent incidents (last 30 days)
         if app.config.get('USE_POSTGRESQL'):
             cursor.execute("""